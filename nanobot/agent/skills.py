@@ -9,6 +9,9 @@ from pathlib import Path
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
+# Single-pass escaping for text placed inside the skills XML summary
+_XML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
 
 class SkillsLoader:
     """
@@ -113,7 +116,7 @@ class SkillsLoader:
             return ""
         
         def escape_xml(s: str) -> str:
-            return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+            return s.translate(_XML_ESCAPE_TABLE)
         
         lines = ["<skills>"]
         for s in all_skills:
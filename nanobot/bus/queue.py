@@ -38,6 +38,13 @@ class MessageBus:
         """Consume the next outbound message (blocks until available)."""
         return await self.outbound.get()
     
+    def drain_outbound(self) -> list[OutboundMessage]:
+        """Take all outbound messages that are already queued, without waiting."""
+        msgs = []
+        while not self.outbound.empty():
+            msgs.append(self.outbound.get_nowait())
+        return msgs
+    
     def subscribe_outbound(
         self, 
         channel: str, 
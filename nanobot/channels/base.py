@@ -58,6 +58,22 @@ class BaseChannel(ABC):
         """
         pass
     
+    async def send_many(self, msgs: list[OutboundMessage]) -> None:
+        """
+        Send a batch of messages.
+        
+        The default sends them one by one, in order. Channels that can overlap
+        requests (e.g. to different chats) may override this.
+        
+        Args:
+            msgs: The messages to send.
+        """
+        for msg in msgs:
+            try:
+                await self.send(msg)
+            except Exception as e:
+                logger.error(f"Error sending to {self.name}: {e}")
+    
     def is_allowed(self, sender_id: str) -> bool:
         """
         Check if a sender is allowed to use this bot.
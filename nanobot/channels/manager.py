@@ -227,14 +227,20 @@ class ChannelManager:
                     timeout=1.0
                 )
                 
-                channel = self.channels.get(msg.channel)
-                if channel:
-                    try:
-                        await channel.send(msg)
-                    except Exception as e:
-                        logger.error(f"Error sending to {msg.channel}: {e}")
-                else:
-                    logger.warning(f"Unknown channel: {msg.channel}")
+                # Hand everything already queued to each channel as one batch
+                batches: dict[str, list[OutboundMessage]] = {}
+                for m in [msg, *self.bus.drain_outbound()]:
+                    batches.setdefault(m.channel, []).append(m)
+                
+                for name, msgs in batches.items():
+                    channel = self.channels.get(name)
+                    if channel:
+                        try:
+                            await channel.send_many(msgs)
+                        except Exception as e:
+                            logger.error(f"Error sending to {name}: {e}")
+                    else:
+                        logger.warning(f"Unknown channel: {name}")
                     
             except asyncio.TimeoutError:
                 continue
@@ -3,9 +3,16 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import re
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import httpx
 from loguru import logger
-from telegram import BotCommand, Update
+from telegram import BotCommand, File, Update
+from telegram.error import Conflict
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
 from telegram.request import HTTPXRequest
 
@@ -13,69 +20,219 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import TelegramConfig
+from nanobot.providers.transcription import GroqTranscriptionProvider
+from nanobot.utils.helpers import ensure_dir
 
+# Markdown patterns, compiled once at import time (used on every outbound message)
+_RE_CODE_BLOCK = re.compile(r'```[\w]*\n?([\s\S]*?)```')
+_RE_INLINE_CODE = re.compile(r'`([^`]+)`')
+_RE_HEADER = re.compile(r'#{1,6}\s+(.+)')
+# Inline rules in one alternation: a single scan instead of one pass per rule
+_RE_INLINE = re.compile(
+    r'\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)]+)\)'
+    r'|\*\*(?P<bold_star>.+?)\*\*'
+    r'|__(?P<bold_under>.+?)__'
+    r'|(?<![a-zA-Z0-9])_(?P<italic>[^_]+)_(?![a-zA-Z0-9])'  # not inside some_var_name
+    r'|~~(?P<strike>.+?)~~'
+)
+_INLINE_TAGS = {"bold_star": "b", "bold_under": "b", "italic": "i", "strike": "s"}
+_RE_BULLET = re.compile(r'[-*]\s+')
+_RE_PLACEHOLDER = re.compile(r'\x00(CB|IC)(\d+)\x00')
+_RE_PARSE_ERROR = re.compile(r'parse|entities|tag', re.IGNORECASE)
 
-def _markdown_to_telegram_html(text: str) -> str:
+# Single-pass HTML escaping for &, < and >
+_HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+# Characters that can trigger any markdown rule below ('-' and '*' start bullets)
+_RE_MARKDOWN_CHAR = re.compile(r'[`#>\[*_~-]')
+
+# Tags emitted by the converter that must be balanced across split chunks
+_TRACKED_TAGS = frozenset(("b", "i", "u", "s", "a", "code", "pre"))
+
+# File extensions for downloaded media, by MIME type and by media type
+_MIME_EXTENSIONS = {
+    "image/jpeg": ".jpg", "image/png": ".png", "image/gif": ".gif",
+    "audio/ogg": ".ogg", "audio/mpeg": ".mp3", "audio/mp4": ".m4a",
+}
+_MEDIA_TYPE_EXTENSIONS = {"image": ".jpg", "voice": ".ogg", "audio": ".mp3", "file": ""}
+
+# Telegram message limit is 4096 characters
+_MAX_MESSAGE_LENGTH = 4096
+
+
+def _inline_to_html(m: re.Match) -> str:
+    """Render one inline markdown match, converting nested markup in its text."""
+    kind = m.lastgroup
+    if kind == "link_url":
+        # The URL is emitted as-is so no inline rule can rewrite the href
+        return f'<a href="{m["link_url"]}">{_RE_INLINE.sub(_inline_to_html, m["link_text"])}</a>'
+    tag = _INLINE_TAGS[kind]
+    return f"<{tag}>{_RE_INLINE.sub(_inline_to_html, m[kind])}</{tag}>"
+
+
+def _render_telegram_html(text: str) -> str:
     """
     Convert markdown to Telegram-safe HTML.
     """
     if not text:
         return ""
     
-    # 1. Extract and protect code blocks (preserve content from other processing)
+    # NUL delimits the code placeholders below, so it must not occur in the input
+    if "\x00" in text:
+        text = text.replace("\x00", "")
+    
+    # 1. Extract and protect code blocks (stored already escaped and wrapped)
     code_blocks: list[str] = []
     def save_code_block(m: re.Match) -> str:
-        code_blocks.append(m.group(1))
+        code_blocks.append(f"<pre><code>{m.group(1).translate(_HTML_ESCAPE_TABLE)}</code></pre>")
         return f"\x00CB{len(code_blocks) - 1}\x00"
     
-    text = re.sub(r'```[\w]*\n?([\s\S]*?)```', save_code_block, text)
+    text = _RE_CODE_BLOCK.sub(save_code_block, text)
     
     # 2. Extract and protect inline code
     inline_codes: list[str] = []
     def save_inline_code(m: re.Match) -> str:
-        inline_codes.append(m.group(1))
+        inline_codes.append(f"<code>{m.group(1).translate(_HTML_ESCAPE_TABLE)}</code>")
         return f"\x00IC{len(inline_codes) - 1}\x00"
     
-    text = re.sub(r'`([^`]+)`', save_inline_code, text)
+    text = _RE_INLINE_CODE.sub(save_inline_code, text)
     
-    # 3. Headers # Title -> just the title text
-    text = re.sub(r'^#{1,6}\s+(.+)$', r'\1', text, flags=re.MULTILINE)
+    # 3. Line prefixes in one pass (before HTML escaping):
+    #    # Title -> Title, > text -> text, - item -> • item
+    lines = text.split('\n')
+    for i, line in enumerate(lines):
+        if not line.startswith(('#', '>', '-', '*')):
+            continue
+        if line.startswith('#') and (m := _RE_HEADER.match(line)):
+            line = m.group(1)
+        if line.startswith('>'):
+            line = line[1:].lstrip()
+        if line.startswith(('-', '*')) and (m := _RE_BULLET.match(line)):
+            line = '• ' + line[m.end():]
+        lines[i] = line
+    text = '\n'.join(lines)
     
-    # 4. Blockquotes > text -> just the text (before HTML escaping)
-    text = re.sub(r'^>\s*(.*)$', r'\1', text, flags=re.MULTILINE)
+    # 4. Escape HTML special characters (link URLs below are already &amp;-safe)
+    text = text.translate(_HTML_ESCAPE_TABLE)
     
-    # 5. Escape HTML special characters
-    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    # 5. Links [text](url), bold **text** / __text__, italic _text_ and
+    #    strikethrough ~~text~~ in a single pass
+    text = _RE_INLINE.sub(_inline_to_html, text)
     
-    # 6. Links [text](url) - must be before bold/italic to handle nested cases
-    text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2">\1</a>', text)
+    # 6. Restore inline code and code blocks in a single pass
+    def restore(m: re.Match) -> str:
+        fragments = code_blocks if m.group(1) == "CB" else inline_codes
+        return fragments[int(m.group(2))]
     
-    # 7. Bold **text** or __text__
-    text = re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', text)
-    text = re.sub(r'__(.+?)__', r'<b>\1</b>', text)
+    if code_blocks or inline_codes:
+        text = _RE_PLACEHOLDER.sub(restore, text)
     
-    # 8. Italic _text_ (avoid matching inside words like some_var_name)
-    text = re.sub(r'(?<![a-zA-Z0-9])_([^_]+)_(?![a-zA-Z0-9])', r'<i>\1</i>', text)
-    
-    # 9. Strikethrough ~~text~~
-    text = re.sub(r'~~(.+?)~~', r'<s>\1</s>', text)
-    
-    # 10. Bullet lists - item -> • item
-    text = re.sub(r'^[-*]\s+', '• ', text, flags=re.MULTILINE)
+    return text
+
+
+# Canned replies repeat often; skip the cache for large one-off messages
+_render_telegram_html_cached = functools.lru_cache(maxsize=512)(_render_telegram_html)
+_HTML_CACHE_MAX_INPUT = 16384
+
+
+def _markdown_to_telegram_html(text: str) -> str:
+    """Convert markdown to Telegram-safe HTML, memoizing short inputs."""
+    # Fast path: plain text only needs HTML escaping, and isn't worth a cache slot
+    if _RE_MARKDOWN_CHAR.search(text) is None:
+        return text.translate(_HTML_ESCAPE_TABLE)
+    if len(text) > _HTML_CACHE_MAX_INPUT:
+        return _render_telegram_html(text)
+    return _render_telegram_html_cached(text)
+
+
+def _update_tag_stack(stack: list[tuple[str, str]], text: str, start: int, end: int) -> None:
+    """Apply the HTML tags found in text[start:end] to a stack of (name, opening tag)."""
+    # Text content is already escaped, so every '<' here starts one of our tags
+    i = text.find('<', start, end)
+    while i != -1:
+        j = text.find('>', i + 1, end)
+        if j == -1:
+            break
+        tag = text[i + 1:j]
+        if tag.startswith('/'):
+            name = tag[1:]
+            for k in range(len(stack) - 1, -1, -1):
+                if stack[k][0] == name:
+                    del stack[k]
+                    break
+        else:
+            name = tag.split(' ', 1)[0]
+            if name in _TRACKED_TAGS:
+                stack.append((name, text[i:j + 1]))
+        i = text.find('<', j + 1, end)
+
+
+@functools.lru_cache(maxsize=64)
+def _tag_boundary(stack: tuple[tuple[str, str], ...]) -> tuple[str, str]:
+    """Return the (closing, reopening) tag strings for a stack of open tags."""
+    close = "".join([f"</{name}>" for name, _ in reversed(stack)])
+    reopen = "".join([open_tag for _, open_tag in stack])
+    return close, reopen
+
+
+def _split_long_message(
+    text: str,
+    max_length: int = _MAX_MESSAGE_LENGTH,
+    html: bool = True,
+) -> Iterator[str]:
+    """
+    Yield chunks of text of at most max_length, preferring line boundaries.
     
-    # 11. Restore inline code with HTML tags
-    for i, code in enumerate(inline_codes):
-        # Escape HTML in code content
-        escaped = code.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        text = text.replace(f"\x00IC{i}\x00", f"<code>{escaped}</code>")
+    With html=True, tags left open at a chunk boundary are closed at the end of
+    that chunk and reopened at the start of the next one.
+    """
+    # Fast path: the common single short reply needs no splitting work at all
+    if len(text) <= max_length:
+        yield text
+        return
     
-    # 12. Restore code blocks with HTML tags
-    for i, code in enumerate(code_blocks):
-        # Escape HTML in code content
-        escaped = code.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        text = text.replace(f"\x00CB{i}\x00", f"<pre><code>{escaped}</code></pre>")
+    # Tag stack is updated incrementally, so each character is scanned once.
+    # Markup doesn't count toward Telegram's limit, so close/reopen tags are free.
+    html = html and '<' in text
+    tag_stack: list[tuple[str, str]] = []
+    reopen = ""
     
-    return text
+    start = 0
+    while len(text) - start > max_length:
+        end = start + max_length
+        # Bounded scans on the original string: no per-chunk slice copies
+        limit = end
+        while True:
+            split_pos = text.rfind('\n', start, limit)
+            if split_pos <= start:
+                split_pos = text.rfind(' ', start, limit)
+            if split_pos <= start or not html:
+                break
+            # Never split inside a tag (<a href="..."> contains a space): retry before it
+            tag_pos = text.rfind('<', start, split_pos)
+            if tag_pos <= text.rfind('>', start, split_pos):
+                break
+            limit = tag_pos
+        if split_pos <= start:
+            split_pos = end
+            # Hard cut: don't break an HTML tag or entity in half
+            for open_char, close_char in (('<', '>'), ('&', ';')):
+                pos = text.rfind(open_char, start, split_pos)
+                if pos > start and pos > text.rfind(close_char, start, split_pos):
+                    split_pos = pos
+        chunk = text[start:split_pos].rstrip()
+        if html:
+            _update_tag_stack(tag_stack, text, start, split_pos)
+            close, next_reopen = _tag_boundary(tuple(tag_stack))
+            if chunk:
+                chunk = "".join((reopen, chunk, close))
+            reopen = next_reopen
+        if chunk:
+            yield chunk
+        start = split_pos + 1 if text[split_pos] in '\n ' else split_pos
+    chunk = text[start:].rstrip()
+    if chunk:
+        yield reopen + chunk
 
 
 class TelegramChannel(BaseChannel):
@@ -94,6 +251,24 @@ class TelegramChannel(BaseChannel):
         BotCommand("help", "Show available commands"),
     ]
     
+    # Updates handled by _on_message (built once, reused across restarts)
+    MESSAGE_FILTER = (
+        (filters.TEXT | filters.PHOTO | filters.VOICE | filters.AUDIO | filters.Document.ALL)
+        & ~filters.COMMAND
+    )
+    
+    # Minimum spacing between chunks of a split message (seconds)
+    CHUNK_INTERVAL = 0.5
+    
+    # Media larger than this is streamed to disk instead of buffered in memory
+    STREAM_DOWNLOAD_THRESHOLD = 1024 * 1024
+    
+    # Chats sent to concurrently by send_many (Telegram allows ~30 msg/s overall)
+    MAX_CONCURRENT_SENDS = 25
+    
+    # Most recent senders remembered in _chat_ids (usernames can change, so keys churn)
+    MAX_CHAT_IDS = 10_000
+    
     def __init__(
         self,
         config: TelegramConfig,
@@ -104,8 +279,15 @@ class TelegramChannel(BaseChannel):
         self.config: TelegramConfig = config
         self.groq_api_key = groq_api_key
         self._app: Application | None = None
-        self._chat_ids: dict[str, int] = {}  # Map sender_id to chat_id for replies
-        self._typing_tasks: dict[str, asyncio.Task] = {}  # chat_id -> typing loop task
+        self._http: httpx.AsyncClient | None = None  # Streams large media downloads
+        self._media_dir = ensure_dir(Path.home() / ".nanobot" / "media")
+        self._transcriber = GroqTranscriptionProvider(api_key=groq_api_key)
+        self._chat_ids: OrderedDict[str, int] = OrderedDict()  # Map sender_id to chat_id for replies (LRU)
+        self._typing_chats: set[int] = set()  # Chats currently showing "typing..."
+        self._typing_task: asyncio.Task | None = None  # Shared typing loop for all chats
+        self._typing_requests: dict[int, asyncio.Task] = {}  # In-flight 'typing' action per chat
+        self._stop_event = asyncio.Event()  # Set by stop() to release start()
+        self._dropped_pending = False  # Backlog is discarded on first start only
     
     async def start(self) -> None:
         """Start the Telegram bot with long polling."""
@@ -114,13 +296,30 @@ class TelegramChannel(BaseChannel):
             return
         
         self._running = True
+        self._stop_event.clear()
         
-        # Build the application with larger connection pool to avoid pool-timeout on long runs
-        req = HTTPXRequest(connection_pool_size=16, pool_timeout=5.0, connect_timeout=30.0, read_timeout=30.0)
-        builder = Application.builder().token(self.config.token).request(req).get_updates_request(req)
-        if self.config.proxy:
-            builder = builder.proxy(self.config.proxy).get_updates_proxy(self.config.proxy)
-        self._app = builder.build()
+        # Build the application with larger connection pool to avoid pool-timeout on long runs.
+        # The proxy goes to HTTPXRequest directly: the builder rejects .proxy() with a custom request.
+        request = HTTPXRequest(
+            connection_pool_size=16,
+            pool_timeout=5.0,
+            connect_timeout=30.0,
+            read_timeout=30.0,
+            proxy=self.config.proxy or None,
+        )
+        # getUpdates holds a connection for the whole long-poll, so it gets its
+        # own small pool rather than competing with sends
+        updates_request = HTTPXRequest(
+            connection_pool_size=4,
+            pool_timeout=5.0,
+            connect_timeout=30.0,
+            read_timeout=30.0,
+            proxy=self.config.proxy or None,
+        )
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=60.0, proxy=self.config.proxy or None)
+        builder = Application.builder().token(self.config.token)
+        self._app = builder.request(request).get_updates_request(updates_request).build()
         self._app.add_error_handler(self._on_error)
         
         # Add command handlers
@@ -129,79 +328,102 @@ class TelegramChannel(BaseChannel):
         self._app.add_handler(CommandHandler("help", self._forward_command))
         
         # Add message handler for text, photos, voice, documents
-        self._app.add_handler(
-            MessageHandler(
-                (filters.TEXT | filters.PHOTO | filters.VOICE | filters.AUDIO | filters.Document.ALL) 
-                & ~filters.COMMAND, 
-                self._on_message
-            )
-        )
+        self._app.add_handler(MessageHandler(self.MESSAGE_FILTER, self._on_message))
         
         logger.info("Starting Telegram bot (polling mode)...")
 
-        # Initialize and start polling
-        await self._app.initialize()
-        await self._app.start()
-
-        # Clear any existing webhooks to prevent conflicts
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                await self._app.bot.delete_webhook(drop_pending_updates=True)
-                logger.debug("Cleared any existing webhooks")
-                break
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 5
-                    logger.warning(f"Failed to clear webhooks (attempt {attempt + 1}/{max_retries}): {e}. Retrying in {wait_time}s...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.warning(f"Failed to clear webhooks after {max_retries} attempts: {e}")
+        try:
+            # Initialize and start polling
+            await self._app.initialize()
+            await self._app.start()
 
-        # Get bot info and register command menu
-        bot_info = await self._app.bot.get_me()
-        logger.info(f"Telegram bot @{bot_info.username} connected")
+            # Drop stale updates on first boot only; after a restart they are
+            # messages received while reconnecting
+            drop_pending = not self._dropped_pending
+            
+            # Clear any existing webhooks to prevent conflicts
+            max_retries = 3
+            for attempt in range(max_retries):
+                try:
+                    await self._app.bot.delete_webhook(drop_pending_updates=drop_pending)
+                    logger.debug("Cleared any existing webhooks")
+                    break
+                except Exception as e:
+                    if attempt < max_retries - 1:
+                        wait_time = (attempt + 1) * 5
+                        logger.warning(f"Failed to clear webhooks (attempt {attempt + 1}/{max_retries}): {e}. Retrying in {wait_time}s...")
+                        await asyncio.sleep(wait_time)
+                    else:
+                        logger.warning(f"Failed to clear webhooks after {max_retries} attempts: {e}")
 
-        try:
-            await self._app.bot.set_my_commands(self.BOT_COMMANDS)
-            logger.debug("Telegram bot commands registered")
-        except Exception as e:
-            logger.warning(f"Failed to register bot commands: {e}")
+            # Get bot info and register command menu
+            bot_info = await self._app.bot.get_me()
+            logger.info(f"Telegram bot @{bot_info.username} connected")
 
-        # Start polling with retry on conflict
-        for attempt in range(max_retries):
             try:
-                await self._app.updater.start_polling(
-                    allowed_updates=["message"],
-                    drop_pending_updates=True  # Ignore old messages on startup
-                )
-                break
+                await self._app.bot.set_my_commands(self.BOT_COMMANDS)
+                logger.debug("Telegram bot commands registered")
             except Exception as e:
-                if "Conflict" in str(e) and attempt < max_retries - 1:
+                logger.warning(f"Failed to register bot commands: {e}")
+
+            # Start polling with retry on conflict
+            for attempt in range(max_retries):
+                try:
+                    await self._app.updater.start_polling(
+                        allowed_updates=["message"],
+                        timeout=25,  # Longer long-poll means fewer empty getUpdates round trips
+                        drop_pending_updates=drop_pending,
+                    )
+                    self._dropped_pending = True
+                    break
+                except Conflict:
+                    if attempt == max_retries - 1:
+                        raise
                     wait_time = (attempt + 1) * 10
                     logger.warning(f"Polling conflict detected (attempt {attempt + 1}/{max_retries}). Waiting {wait_time}s for other instances to timeout...")
                     await asyncio.sleep(wait_time)
-                else:
-                    raise
+        except Exception:
+            # Don't leave a half-started application behind for the next attempt
+            await self._shutdown_app()
+            raise
         
-        # Keep running until stopped
-        while self._running:
-            await asyncio.sleep(1)
+        # Keep running until stopped; polling runs in the updater's own task
+        await self._stop_event.wait()
     
     async def stop(self) -> None:
         """Stop the Telegram bot."""
         self._running = False
+        self._stop_event.set()
         
         # Cancel all typing indicators
-        for chat_id in list(self._typing_tasks):
-            self._stop_typing(chat_id)
+        self._typing_chats.clear()
+        if self._typing_task and not self._typing_task.done():
+            self._typing_task.cancel()
+        self._typing_task = None
+        for task in self._typing_requests.values():
+            task.cancel()
+        self._typing_requests.clear()
         
         if self._app:
             logger.info("Stopping Telegram bot...")
-            await self._app.updater.stop()
-            await self._app.stop()
-            await self._app.shutdown()
-            self._app = None
+            await self._shutdown_app()
+        
+        if self._http:
+            await self._http.aclose()
+            self._http = None
+        
+        await self._transcriber.close()
+    
+    async def _shutdown_app(self) -> None:
+        """Stop polling and shut down the application, whatever state it reached."""
+        app, self._app = self._app, None
+        if not app:
+            return
+        if app.updater and app.updater.running:
+            await app.updater.stop()
+        if app.running:
+            await app.stop()
+        await app.shutdown()
     
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Telegram."""
@@ -209,78 +431,102 @@ class TelegramChannel(BaseChannel):
             logger.warning("Telegram bot not running")
             return
 
-        # Stop typing indicator for this chat
-        self._stop_typing(msg.chat_id)
-
         try:
             # chat_id should be the Telegram chat ID (integer)
             chat_id = int(msg.chat_id)
-            # Convert markdown to Telegram HTML
-            html_content = _markdown_to_telegram_html(msg.content)
-
-            # Telegram message limit is 4096 characters
-            MAX_LENGTH = 4096
-            if len(html_content) <= MAX_LENGTH:
-                await self._app.bot.send_message(
-                    chat_id=chat_id,
-                    text=html_content,
-                    parse_mode="HTML"
-                )
-            else:
-                # Split message into chunks
-                chunks = []
-                current_chunk = ""
-                for line in html_content.split('\n'):
-                    if len(current_chunk) + len(line) + 1 <= MAX_LENGTH:
-                        current_chunk += line + '\n'
-                    else:
-                        if current_chunk:
-                            chunks.append(current_chunk.rstrip())
-                        current_chunk = line + '\n'
-                if current_chunk:
-                    chunks.append(current_chunk.rstrip())
-
-                # Send chunks
-                for i, chunk in enumerate(chunks):
-                    if i > 0:
-                        await asyncio.sleep(0.5)  # Small delay between messages
-                    await self._app.bot.send_message(
-                        chat_id=chat_id,
-                        text=chunk,
-                        parse_mode="HTML"
-                    )
         except ValueError:
             logger.error(f"Invalid chat_id: {msg.chat_id}")
+            return
+
+        # Stop typing indicator for this chat
+        self._stop_typing(chat_id)
+
+        try:
+            # Convert markdown to Telegram HTML
+            html_content = _markdown_to_telegram_html(msg.content)
+            await self._send_chunks(chat_id, _split_long_message(html_content), parse_mode="HTML")
         except Exception as e:
-            # Fallback to plain text if HTML parsing fails
-            error_msg = str(e)
-            logger.warning(f"HTML parse failed, falling back to plain text: {error_msg}")
+            # Fallback to plain text if HTML parsing (or sending) fails
+            if _RE_PARSE_ERROR.search(str(e)):
+                logger.warning(f"HTML parse failed, falling back to plain text: {e}")
+            else:
+                logger.warning(f"HTML send failed, retrying as plain text: {e}")
             try:
-                content = msg.content
-                MAX_LENGTH = 4096
-                if len(content) <= MAX_LENGTH:
-                    await self._app.bot.send_message(
-                        chat_id=int(msg.chat_id),
-                        text=content
-                    )
-                else:
-                    # Split plain text into chunks
-                    for i in range(0, len(content), MAX_LENGTH):
-                        if i > 0:
-                            await asyncio.sleep(0.5)
-                        chunk = content[i:i+MAX_LENGTH]
-                        # Ensure we don't break in the middle of a line if possible
-                        if i + MAX_LENGTH < len(content):
-                            last_newline = chunk.rfind('\n')
-                            if last_newline > MAX_LENGTH * 0.8:  # Only if we're not losing too much
-                                chunk = chunk[:last_newline]
-                        await self._app.bot.send_message(
-                            chat_id=int(msg.chat_id),
-                            text=chunk
-                        )
+                await self._send_chunks(chat_id, _split_long_message(msg.content, html=False))
             except Exception as e2:
                 logger.error(f"Error sending Telegram message: {e2}")
     
+    async def send_many(self, msgs: list[OutboundMessage]) -> None:
+        """Send a batch, overlapping different chats while keeping each chat in order."""
+        by_chat: dict[str, list[OutboundMessage]] = {}
+        for msg in msgs:
+            by_chat.setdefault(msg.chat_id, []).append(msg)
+        
+        sem = asyncio.Semaphore(self.MAX_CONCURRENT_SENDS)
+        
+        async def send_chat(chat_msgs: list[OutboundMessage]) -> None:
+            async with sem:
+                for group, html in self._coalesce(chat_msgs):
+                    await self._send_group(group, html)
+        
+        results = await asyncio.gather(
+            *(send_chat(chat_msgs) for chat_msgs in by_chat.values()),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error sending Telegram message: {result}")
+    
+    @staticmethod
+    def _coalesce(msgs: list[OutboundMessage]) -> list[tuple[list[OutboundMessage], str]]:
+        """
+        Group consecutive queued messages for one chat while their HTML fits in a
+        single Telegram message, saving a round trip (and rate-limit budget) per merge.
+        
+        Each message is converted on its own and the HTML joined afterwards, so
+        markdown left open in one reply can never pair up with the next one.
+        """
+        groups: list[tuple[list[OutboundMessage], str]] = []
+        for msg in msgs:
+            html = _markdown_to_telegram_html(msg.content)
+            if groups and len(groups[-1][1]) + len(html) + 2 <= _MAX_MESSAGE_LENGTH:
+                group, merged = groups[-1]
+                group.append(msg)
+                groups[-1] = (group, f"{merged}\n\n{html}")
+            else:
+                groups.append(([msg], html))
+        return groups
+    
+    async def _send_group(self, msgs: list[OutboundMessage], html: str) -> None:
+        """Send a coalesced group as one message, or each message on its own if that fails."""
+        if len(msgs) > 1 and self._app:
+            try:
+                chat_id = int(msgs[0].chat_id)
+                self._stop_typing(chat_id)
+                await self._app.bot.send_message(chat_id=chat_id, text=html, parse_mode="HTML")
+                return
+            except Exception as e:
+                # Retry separately so one bad reply doesn't push the others to plain text
+                logger.warning(f"Merged send failed, sending {len(msgs)} messages separately: {e}")
+        for msg in msgs:
+            await self.send(msg)
+    
+    async def _send_chunks(self, chat_id: int, chunks: Iterable[str], parse_mode: str | None = None) -> None:
+        """
+        Send message chunks in order, spaced at least CHUNK_INTERVAL apart.
+        
+        Chunks are not sent concurrently since Telegram could deliver them out of
+        order; instead the spacing delay overlaps with each request's round trip.
+        """
+        loop = asyncio.get_running_loop()
+        next_send = 0.0
+        for chunk in chunks:
+            delay = next_send - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            next_send = loop.time() + self.CHUNK_INTERVAL
+            await self._app.bot.send_message(chat_id=chat_id, text=chunk, parse_mode=parse_mode)
+    
     async def _on_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command."""
         if not update.message or not update.effective_user:
@@ -313,12 +559,17 @@ class TelegramChannel(BaseChannel):
         chat_id = message.chat_id
         
         # Use stable numeric ID, but keep username for allowlist compatibility
-        sender_id = str(user.id)
-        if user.username:
-            sender_id = f"{sender_id}|{user.username}"
+        sender_id = f"{user.id}|{user.username}" if user.username else str(user.id)
         
-        # Store chat_id for replies
+        # Store chat_id for replies, evicting the least recently seen sender
         self._chat_ids[sender_id] = chat_id
+        self._chat_ids.move_to_end(sender_id)
+        if len(self._chat_ids) > self.MAX_CHAT_IDS:
+            self._chat_ids.popitem(last=False)
+        
+        # Start typing indicator right away; its request runs concurrently
+        # with the media download and transcription below
+        self._start_typing(chat_id)
         
         # Build content from text and/or media
         content_parts = []
@@ -333,41 +584,39 @@ class TelegramChannel(BaseChannel):
         # Handle media files
         media_file = None
         media_type = None
+        mime_type = None
         
         if message.photo:
-            media_file = message.photo[-1]  # Largest photo
+            media_file = message.photo[-1]  # Largest photo (PhotoSize has no mime_type)
             media_type = "image"
         elif message.voice:
             media_file = message.voice
             media_type = "voice"
+            mime_type = media_file.mime_type
         elif message.audio:
             media_file = message.audio
             media_type = "audio"
+            mime_type = media_file.mime_type
         elif message.document:
             media_file = message.document
             media_type = "file"
+            mime_type = media_file.mime_type
         
         # Download media if present
         if media_file and self._app:
             try:
                 file = await self._app.bot.get_file(media_file.file_id)
-                ext = self._get_extension(media_type, getattr(media_file, 'mime_type', None))
+                ext = self._get_extension(media_type, mime_type)
                 
-                # Save to workspace/media/
-                from pathlib import Path
-                media_dir = Path.home() / ".nanobot" / "media"
-                media_dir.mkdir(parents=True, exist_ok=True)
-                
-                file_path = media_dir / f"{media_file.file_id[:16]}{ext}"
-                await file.download_to_drive(str(file_path))
+                # Save to ~/.nanobot/media/
+                file_path = self._media_dir / f"{media_file.file_id[:16]}{ext}"
+                await self._download(file, file_path)
                 
                 media_paths.append(str(file_path))
                 
                 # Handle voice transcription
                 if media_type == "voice" or media_type == "audio":
-                    from nanobot.providers.transcription import GroqTranscriptionProvider
-                    transcriber = GroqTranscriptionProvider(api_key=self.groq_api_key)
-                    transcription = await transcriber.transcribe(file_path)
+                    transcription = await self._transcriber.transcribe(file_path)
                     if transcription:
                         logger.info(f"Transcribed {media_type}: {transcription[:50]}...")
                         content_parts.append(f"[transcription: {transcription}]")
@@ -387,9 +636,6 @@ class TelegramChannel(BaseChannel):
         
         str_chat_id = str(chat_id)
         
-        # Start typing indicator before processing
-        self._start_typing(str_chat_id)
-        
         # Forward to the message bus
         await self._handle_message(
             sender_id=sender_id,
@@ -405,42 +651,84 @@ class TelegramChannel(BaseChannel):
             }
         )
     
-    def _start_typing(self, chat_id: str) -> None:
+    async def _download(self, file: File, dest: Path) -> None:
+        """Download a Telegram file, streaming large ones to disk in chunks."""
+        url = file.file_path or ""
+        if (file.file_size or 0) < self.STREAM_DOWNLOAD_THRESHOLD or not self._http or not url.startswith("http"):
+            await file.download_to_drive(str(dest))
+            return
+        
+        # The file URL embeds the bot token, so errors raised here must not include it
+        try:
+            async with self._http.stream("GET", url) as response:
+                if not response.is_success:
+                    raise RuntimeError(f"Telegram file download failed with HTTP {response.status_code}")
+                with open(dest, "wb") as f:
+                    async for chunk in response.aiter_bytes(64 * 1024):
+                        f.write(chunk)
+        except BaseException as e:
+            dest.unlink(missing_ok=True)  # Don't leave a truncated file behind
+            if isinstance(e, httpx.HTTPError):
+                raise RuntimeError(f"Telegram file download failed: {type(e).__name__}") from None
+            raise
+    
+    def _start_typing(self, chat_id: int) -> None:
         """Start sending 'typing...' indicator for a chat."""
-        # Cancel any existing typing task for this chat
-        self._stop_typing(chat_id)
-        self._typing_tasks[chat_id] = asyncio.create_task(self._typing_loop(chat_id))
+        self._typing_chats.add(chat_id)
+        if self._typing_task is None or self._typing_task.done():
+            self._typing_task = asyncio.create_task(self._typing_loop())
+        else:
+            # The shared loop only ticks every few seconds; show the indicator now
+            self._request_typing(chat_id)
     
-    def _stop_typing(self, chat_id: str) -> None:
+    def _stop_typing(self, chat_id: int) -> None:
         """Stop the typing indicator for a chat."""
-        task = self._typing_tasks.pop(chat_id, None)
-        if task and not task.done():
+        self._typing_chats.discard(chat_id)
+        # Cancel an action still in flight so it can't land after the reply
+        task = self._typing_requests.pop(chat_id, None)
+        if task:
             task.cancel()
     
-    async def _typing_loop(self, chat_id: str) -> None:
-        """Repeatedly send 'typing' action until cancelled."""
+    def _request_typing(self, chat_id: int) -> asyncio.Task:
+        """Send one 'typing' action as a task tracked per chat until it finishes."""
+        task = self._typing_requests.get(chat_id)
+        if task is None or task.done():
+            task = asyncio.create_task(self._send_typing(chat_id))
+            self._typing_requests[chat_id] = task
+            task.add_done_callback(functools.partial(self._typing_request_done, chat_id))
+        return task
+    
+    def _typing_request_done(self, chat_id: int, task: asyncio.Task) -> None:
+        """Drop a finished typing request, unless a newer one replaced it."""
+        if self._typing_requests.get(chat_id) is task:
+            del self._typing_requests[chat_id]
+    
+    async def _typing_loop(self) -> None:
+        """Send 'typing' to all active chats every 4s until none remain."""
         try:
-            while self._app:
-                await self._app.bot.send_chat_action(chat_id=int(chat_id), action="typing")
+            while self._app and self._typing_chats:
+                await asyncio.gather(
+                    *(self._request_typing(c) for c in list(self._typing_chats)),
+                    return_exceptions=True,  # Requests cancelled by _stop_typing
+                )
                 await asyncio.sleep(4)
         except asyncio.CancelledError:
             pass
+    
+    async def _send_typing(self, chat_id: int) -> None:
+        """Send a single 'typing' chat action."""
+        if not self._app:
+            return
+        try:
+            await self._app.bot.send_chat_action(chat_id=chat_id, action="typing")
         except Exception as e:
-            logger.debug(f"Typing indicator stopped for {chat_id}: {e}")
+            logger.debug(f"Typing indicator failed for {chat_id}: {e}")
     
     async def _on_error(self, update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Log polling / handler errors instead of silently swallowing them."""
         logger.error(f"Telegram error: {context.error}")
 
-    def _get_extension(self, media_type: str, mime_type: str | None) -> str:
+    @staticmethod
+    def _get_extension(media_type: str, mime_type: str | None) -> str:
         """Get file extension based on media type."""
-        if mime_type:
-            ext_map = {
-                "image/jpeg": ".jpg", "image/png": ".png", "image/gif": ".gif",
-                "audio/ogg": ".ogg", "audio/mpeg": ".mp3", "audio/mp4": ".m4a",
-            }
-            if mime_type in ext_map:
-                return ext_map[mime_type]
-        
-        type_map = {"image": ".jpg", "voice": ".ogg", "audio": ".mp3", "file": ""}
-        return type_map.get(media_type, "")
+        return _MIME_EXTENSIONS.get(mime_type) or _MEDIA_TYPE_EXTENSIONS.get(media_type, "")
@@ -1,10 +1,16 @@
 """Configuration loading utilities."""
 
+import functools
 import json
+import re
 from pathlib import Path
 from typing import Any
 
 from nanobot.config.schema import Config
+from nanobot.utils.helpers import json_dumps, json_loads
+
+# Zero-width match before every uppercase letter except a leading one
+_RE_CAMEL_HUMP = re.compile(r"(?<!^)(?=[A-Z])")
 
 
 def get_config_path() -> Path:
@@ -32,8 +38,7 @@ def load_config(config_path: Path | None = None) -> Config:
     
     if path.exists():
         try:
-            with open(path) as f:
-                data = json.load(f)
+            data = json_loads(path.read_bytes())
             data = _migrate_config(data)
             return Config.model_validate(convert_keys(data))
         except (json.JSONDecodeError, ValueError) as e:
@@ -58,8 +63,7 @@ def save_config(config: Config, config_path: Path | None = None) -> None:
     data = config.model_dump()
     data = convert_to_camel(data)
     
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    path.write_text(json_dumps(data, indent=True), encoding="utf-8")
 
 
 def _migrate_config(data: dict) -> dict:
@@ -72,35 +76,37 @@ def _migrate_config(data: dict) -> dict:
     return data
 
 
+# Both converters only see json.load() / model_dump() output, which is built
+# from plain dicts and lists, so exact type checks replace isinstance().
+
 def convert_keys(data: Any) -> Any:
     """Convert camelCase keys to snake_case for Pydantic."""
-    if isinstance(data, dict):
+    if type(data) is dict:
         return {camel_to_snake(k): convert_keys(v) for k, v in data.items()}
-    if isinstance(data, list):
+    if type(data) is list:
         return [convert_keys(item) for item in data]
     return data
 
 
 def convert_to_camel(data: Any) -> Any:
     """Convert snake_case keys to camelCase."""
-    if isinstance(data, dict):
+    if type(data) is dict:
         return {snake_to_camel(k): convert_to_camel(v) for k, v in data.items()}
-    if isinstance(data, list):
+    if type(data) is list:
         return [convert_to_camel(item) for item in data]
     return data
 
 
+@functools.lru_cache(maxsize=1024)
 def camel_to_snake(name: str) -> str:
     """Convert camelCase to snake_case."""
-    result = []
-    for i, char in enumerate(name):
-        if char.isupper() and i > 0:
-            result.append("_")
-        result.append(char.lower())
-    return "".join(result)
+    return _RE_CAMEL_HUMP.sub("_", name).lower()
 
 
+@functools.lru_cache(maxsize=1024)
 def snake_to_camel(name: str) -> str:
     """Convert snake_case to camelCase."""
+    if "_" not in name:
+        return name
     components = name.split("_")
     return components[0] + "".join(x.title() for x in components[1:])
@@ -18,6 +18,7 @@ class GroqTranscriptionProvider:
     def __init__(self, api_key: str | None = None):
         self.api_key = api_key or os.environ.get("GROQ_API_KEY")
         self.api_url = "https://api.groq.com/openai/v1/audio/transcriptions"
+        self._http: httpx.AsyncClient | None = None  # Reused across calls (keep-alive)
     
     async def transcribe(self, file_path: str | Path) -> str:
         """
@@ -38,28 +39,36 @@ class GroqTranscriptionProvider:
             logger.error(f"Audio file not found: {file_path}")
             return ""
         
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient()
+        
         try:
-            async with httpx.AsyncClient() as client:
-                with open(path, "rb") as f:
-                    files = {
-                        "file": (path.name, f),
-                        "model": (None, "whisper-large-v3"),
-                    }
-                    headers = {
-                        "Authorization": f"Bearer {self.api_key}",
-                    }
-                    
-                    response = await client.post(
-                        self.api_url,
-                        headers=headers,
-                        files=files,
-                        timeout=60.0
-                    )
-                    
-                    response.raise_for_status()
-                    data = response.json()
-                    return data.get("text", "")
-                    
+            with open(path, "rb") as f:
+                files = {
+                    "file": (path.name, f),
+                    "model": (None, "whisper-large-v3"),
+                }
+                headers = {
+                    "Authorization": f"Bearer {self.api_key}",
+                }
+                
+                response = await self._http.post(
+                    self.api_url,
+                    headers=headers,
+                    files=files,
+                    timeout=60.0
+                )
+                
+                response.raise_for_status()
+                data = response.json()
+                return data.get("text", "")
+                
         except Exception as e:
             logger.error(f"Groq transcription error: {e}")
             return ""
+    
+    async def close(self) -> None:
+        """Close the underlying HTTP client."""
+        if self._http:
+            await self._http.aclose()
+            self._http = None
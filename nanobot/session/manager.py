@@ -1,6 +1,7 @@
 """Session management for conversation history."""
 
-import json
+import functools
+import os
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -9,7 +10,13 @@ from collections import OrderedDict
 
 from loguru import logger
 
-from nanobot.utils.helpers import ensure_dir, safe_filename
+from nanobot.utils.helpers import ensure_dir, json_dumps, json_dumps_line, json_loads, safe_filename
+
+
+@functools.lru_cache(maxsize=1024)
+def _session_filename(key: str) -> str:
+    """Map a session key to its JSONL file name (bounded memo of safe_filename)."""
+    return f"{safe_filename(key.replace(':', '_'))}.jsonl"
 
 
 @dataclass
@@ -30,6 +37,8 @@ class Session:
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
     last_consolidated: int = 0  # Number of messages already consolidated to files
+    _persisted: int = field(default=0, init=False, repr=False, compare=False)  # Messages already written to disk
+    _persisted_meta: str = field(default="", init=False, repr=False, compare=False)  # Metadata as last written
     
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
@@ -51,6 +60,7 @@ class Session:
         self.messages = []
         self.last_consolidated = 0
         self.updated_at = datetime.now()
+        self._persisted = 0
 
 
 class SessionManager:
@@ -69,8 +79,7 @@ class SessionManager:
     
     def _get_session_path(self, key: str) -> Path:
         """Get the file path for a session."""
-        safe_key = safe_filename(key.replace(":", "_"))
-        return self.sessions_dir / f"{safe_key}.jsonl"
+        return self.sessions_dir / _session_filename(key)
     
     def get_or_create(self, key: str) -> Session:
         """
@@ -106,7 +115,13 @@ class SessionManager:
         return session
     
     def _load(self, key: str) -> Session | None:
-        """Load a session from disk."""
+        """
+        Load a session from disk.
+
+        A malformed last line (an append interrupted by a crash) is dropped and
+        truncated away, keeping the messages before it. A file that fails to
+        parse otherwise is moved aside rather than left to be overwritten.
+        """
         path = self._get_session_path(key)
 
         if not path.exists():
@@ -118,30 +133,59 @@ class SessionManager:
             created_at = None
             last_consolidated = 0
 
-            with open(path) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
+            with open(path, "rb") as f:
+                lines = f.readlines()
+
+            offset = 0
+            truncate_at = None
+            for i, line in enumerate(lines):
+                line_start = offset
+                offset += len(line)
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    data = json_loads(line)
+                except ValueError:
+                    if any(rest.strip() for rest in lines[i + 1:]):
+                        raise
+                    truncate_at = line_start
+                    break
 
-                    data = json.loads(line)
+                if data.get("_type") == "metadata":
+                    metadata = data.get("metadata", {})
+                    created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
+                    last_consolidated = data.get("last_consolidated", 0)
+                else:
+                    messages.append(data)
 
-                    if data.get("_type") == "metadata":
-                        metadata = data.get("metadata", {})
-                        created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
-                        last_consolidated = data.get("last_consolidated", 0)
-                    else:
-                        messages.append(data)
+            if truncate_at is not None:
+                logger.warning(f"Dropping truncated last line of session {key}")
+                os.truncate(path, truncate_at)
+            elif lines and not lines[-1].endswith(b"\n"):
+                # Terminate the last record so the next append starts a new line
+                with open(path, "ab") as f:
+                    f.write(b"\n")
 
-            return Session(
+            session = Session(
                 key=key,
                 messages=messages,
                 created_at=created_at or datetime.now(),
                 metadata=metadata,
                 last_consolidated=last_consolidated
             )
+            session._persisted = len(messages)
+            session._persisted_meta = self._metadata_state(session)
+            return session
         except Exception as e:
-            logger.warning(f"Failed to load session {key}: {e}")
+            # Keep the unreadable file for recovery instead of overwriting it on the next save
+            corrupt = path.with_name(f"{path.name}.corrupt-{datetime.now():%Y%m%d%H%M%S}")
+            try:
+                path.rename(corrupt)
+                logger.warning(f"Failed to load session {key}: {e}; moved it to {corrupt.name}")
+            except OSError as rename_error:
+                logger.error(f"Failed to load session {key}: {e}; could not move it aside: {rename_error}")
             return None
     
     def save(self, session: Session) -> None:
@@ -151,24 +195,45 @@ class SessionManager:
         if session.key in self._cache:
             self._cache.move_to_end(session.key)
 
+    @staticmethod
+    def _metadata_state(session: Session) -> str:
+        """Serialize the metadata fields that must be persisted when they change."""
+        return json_dumps({"metadata": session.metadata, "last_consolidated": session.last_consolidated})
+
     def _save(self, session: Session) -> None:
-        """Internal save method."""
+        """
+        Internal save method.
+
+        Messages are append-only, so only those not yet on disk are appended,
+        followed by a fresh metadata line if it changed (the last metadata line
+        wins on load). The file is rewritten for new or cleared sessions.
+        """
         path = self._get_session_path(session.key)
+        metadata_state = self._metadata_state(session)
+        metadata_line = {
+            "_type": "metadata",
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": session.metadata,
+            "last_consolidated": session.last_consolidated
+        }
 
-        with open(path, "w") as f:
-            metadata_line = {
-                "_type": "metadata",
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata,
-                "last_consolidated": session.last_consolidated
-            }
-            f.write(json.dumps(metadata_line) + "\n")
+        if 0 < session._persisted <= len(session.messages) and path.exists():
+            with open(path, "ab") as f:
+                for msg in session.messages[session._persisted:]:
+                    f.write(json_dumps_line(msg))
+                if metadata_state != session._persisted_meta:
+                    f.write(json_dumps_line(metadata_line))
+        else:
+            with open(path, "wb") as f:
+                f.write(json_dumps_line(metadata_line))
 
-            # Write messages
-            for msg in session.messages:
-                f.write(json.dumps(msg) + "\n")
+                # Write messages
+                for msg in session.messages:
+                    f.write(json_dumps_line(msg))
 
+        session._persisted = len(session.messages)
+        session._persisted_meta = metadata_state
         self._cache[session.key] = session
     
     def invalidate(self, key: str) -> None:
@@ -184,22 +249,27 @@ class SessionManager:
         """
         sessions = []
         
-        for path in self.sessions_dir.glob("*.jsonl"):
-            try:
-                # Read just the metadata line
-                with open(path) as f:
-                    first_line = f.readline().strip()
+        with os.scandir(self.sessions_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".jsonl"):
+                    continue
+                try:
+                    # Read just the metadata line
+                    with open(entry.path, "rb") as f:
+                        first_line = f.readline().strip()
                     if first_line:
-                        data = json.loads(first_line)
+                        data = json_loads(first_line)
                         if data.get("_type") == "metadata":
+                            # Saves append to the file, so the first line's
+                            # updated_at can be stale; the mtime is not
                             sessions.append({
-                                "key": path.stem.replace("_", ":"),
+                                "key": entry.name[:-len(".jsonl")].replace("_", ":"),
                                 "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
-                                "path": str(path)
+                                "updated_at": datetime.fromtimestamp(entry.stat().st_mtime).isoformat(),
+                                "path": entry.path
                             })
-            except Exception:
-                continue
+                except Exception:
+                    continue
         
         return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
 
@@ -1,7 +1,14 @@
 """Utility functions for nanobot."""
 
+import json
 from pathlib import Path
 from datetime import datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON codec, stdlib json otherwise
+    orjson = None
 
 
 def ensure_dir(path: Path) -> Path:
@@ -78,3 +85,22 @@ def parse_session_key(key: str) -> tuple[str, str]:
     if len(parts) != 2:
         raise ValueError(f"Invalid session key: {key}")
     return parts[0], parts[1]
+
+
+def json_dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def json_dumps_line(obj: Any) -> bytes:
+    """Serialize one newline-terminated JSONL record as UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj).encode() + b"\n"
+
+
+# Accepts str or bytes; both backends raise a ValueError subclass on bad input
+json_loads = orjson.loads if orjson is not None else json.loads
@@ -1,35 +1,190 @@
 #!/usr/bin/env python3
 """Diagnose Telegram bot conflicts by checking running processes and connections."""
 
+import argparse
+import functools
+import ipaddress
+import json
+import os
+import re
+import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import psutil
+except ImportError:  # Optional: /proc or ps is used otherwise
+    psutil = None
 
-def run_command(cmd):
-    """Run a shell command and return output."""
+GATEWAY_PORT = 18790
+
+# Same match as `ps aux | grep -E 'python.*nanobot|nanobot.*py'`
+NANOBOT_CMDLINE = re.compile(r"python.*nanobot|nanobot.*py")
+
+# Socket states as encoded in /proc/net/tcp
+TCP_LISTEN = "0A"  # st column of /proc/net/tcp
+
+
+@functools.lru_cache(maxsize=32)
+def run_command(*argv):
+    """Run a command without a shell and return output (memoized: the probes are read-only)."""
     try:
         result = subprocess.run(
-            cmd,
-            shell=True,
+            argv,
             capture_output=True,
             text=True,
             timeout=10
         )
         return result.stdout.strip()
+    except FileNotFoundError:
+        return ""  # Tool not installed
     except Exception as e:
         return f"Error: {e}"
 
 
+def grep(output, pattern, flags=0):
+    """Keep the lines of output matching pattern, like piping through grep."""
+    regex = re.compile(pattern, flags)
+    return "\n".join(line for line in output.splitlines() if regex.search(line))
+
+
+def check_processes():
+    """List running nanobot processes as 'PID COMMAND' lines, via psutil or /proc."""
+    if psutil is not None:
+        lines = []
+        for proc in psutil.process_iter(["pid", "cmdline"]):
+            if proc.info["pid"] == os.getpid() or not proc.info["cmdline"]:
+                continue
+            cmdline = " ".join(proc.info["cmdline"])
+            if NANOBOT_CMDLINE.search(cmdline) and "diagnose" not in cmdline:
+                lines.append(f"{proc.info['pid']:>7}  {cmdline}")
+        return "\n".join(lines)
+
+    if not os.path.isdir("/proc"):
+        # No procfs (e.g. macOS): fall back to ps
+        matches = grep(run_command("ps", "aux"), NANOBOT_CMDLINE.pattern)
+        return "\n".join(line for line in matches.splitlines() if "diagnose" not in line)
+
+    me = str(os.getpid())
+    lines = []
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit() or entry.name == me:
+            continue
+        try:
+            with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                cmdline = f.read().replace(b"\0", b" ").decode(errors="replace").strip()
+        except OSError:
+            continue  # Process exited or is not readable
+        if NANOBOT_CMDLINE.search(cmdline) and "diagnose" not in cmdline:
+            lines.append(f"{entry.name:>7}  {cmdline}")
+    return "\n".join(lines)
+
+
+def decode_proc_address(field):
+    """Decode an 'ADDR:PORT' hex field from /proc/net/tcp or /proc/net/tcp6."""
+    addr, port = field.split(":")
+    raw = bytes.fromhex(addr)
+    if sys.byteorder == "little":
+        # The address is stored as 32-bit words in host byte order
+        raw = b"".join(raw[i:i + 4][::-1] for i in range(0, len(raw), 4))
+    ip = ipaddress.ip_address(raw)
+    return f"[{ip}]:{int(port, 16)}" if ip.version == 6 else f"{ip}:{int(port, 16)}"
+
+
+def check_port():
+    """Show listening sockets on the nanobot gateway port."""
+    if not os.path.exists("/proc/net/tcp"):
+        if shutil.which("ss"):
+            return run_command("ss", "-H", "-ltn", f"sport = :{GATEWAY_PORT}")
+        return run_command("lsof", f"-iTCP:{GATEWAY_PORT}", "-sTCP:LISTEN") or grep(run_command("netstat", "-tuln"), str(GATEWAY_PORT))
+
+    # Read the kernel socket tables directly instead of having lsof walk every fd
+    lines = []
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table) as f:
+                next(f)  # Header
+                for row in f:
+                    local, _, state = row.split()[1:4]
+                    # Only a listener means a gateway is running; TIME_WAIT and client
+                    # sockets linger right after it has been stopped
+                    if state == TCP_LISTEN and int(local.rsplit(":", 1)[1], 16) == GATEWAY_PORT:
+                        lines.append(f"tcp  {decode_proc_address(local):<40} LISTEN")
+        except OSError:
+            continue  # e.g. IPv6 disabled
+    return "\n".join(lines)
+
+
+def check_systemd():
+    """List nanobot systemd user units."""
+    if not shutil.which("systemctl"):
+        return "No systemd services found (systemctl not available)"
+    # Let systemctl filter by unit name instead of listing every unit
+    output = run_command("systemctl", "--user", "list-units", "--no-legend", "--plain", "--no-pager", "*nanobot*")
+    return output or "No systemd services found"
+
+
+def check_screen():
+    """List nanobot screen sessions."""
+    return grep(run_command("screen", "-ls"), "nanobot", re.IGNORECASE) or "No screen sessions"
+
+
+def check_tmux():
+    """List nanobot tmux sessions."""
+    return grep(run_command("tmux", "ls"), "nanobot", re.IGNORECASE) or "No tmux sessions"
+
+
+def check_docker():
+    """List nanobot Docker containers."""
+    return grep(run_command("docker", "ps"), "nanobot") or "No Docker containers found"
+
+
+CHECKS = {
+    "processes": check_processes,
+    "port": check_port,
+    "systemd": check_systemd,
+    "screen": check_screen,
+    "tmux": check_tmux,
+    "docker": check_docker,
+}
+
+
+def run_checks():
+    """Run all checks concurrently; they are independent and mostly wait on subprocesses."""
+    with ThreadPoolExecutor(max_workers=len(CHECKS)) as pool:
+        futures = {name: pool.submit(check) for name, check in CHECKS.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--quiet", action="store_true", help="print check results without banners or advice")
+    mode.add_argument("--json", action="store_true", help="print all check results as a single JSON object")
+    return parser.parse_args()
+
+
 def main():
-    print("=" * 60)
-    print("Telegram Bot Conflict Diagnostic")
-    print("=" * 60)
-    print()
+    args = parse_args()
+    results = run_checks()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    # Banners, separators and the closing advice are skipped with --quiet
+    decor = (lambda *_: None) if args.quiet else print
+
+    decor("=" * 60)
+    decor("Telegram Bot Conflict Diagnostic")
+    decor("=" * 60)
+    decor()
 
     # Check for Python processes
     print("1. Checking for Python/nanobot processes:")
-    print("-" * 60)
-    output = run_command("ps aux | grep -E 'python.*nanobot|nanobot.*py' | grep -v grep | grep -v diagnose")
+    decor("-" * 60)
+    output = results["processes"]
     if output:
         print(output)
         print()
@@ -41,8 +196,8 @@ def main():
 
     # Check for processes on nanobot port
     print("2. Checking port 18790 (nanobot gateway):")
-    print("-" * 60)
-    output = run_command("lsof -i :18790 2>/dev/null || netstat -tuln 2>/dev/null | grep 18790")
+    decor("-" * 60)
+    output = results["port"]
     if output:
         print(output)
         print()
@@ -53,38 +208,34 @@ def main():
 
     # Check systemd services
     print("3. Checking systemd services:")
-    print("-" * 60)
-    output = run_command("systemctl --user list-units | grep nanobot 2>/dev/null || echo 'No systemd services found'")
-    print(output)
+    decor("-" * 60)
+    print(results["systemd"])
     print()
 
     # Check for screen/tmux sessions
     print("4. Checking screen/tmux sessions:")
-    print("-" * 60)
-    screen_output = run_command("screen -ls 2>/dev/null | grep -i nanobot || echo 'No screen sessions'")
-    tmux_output = run_command("tmux ls 2>/dev/null | grep -i nanobot || echo 'No tmux sessions'")
-    print(f"Screen: {screen_output}")
-    print(f"Tmux: {tmux_output}")
+    decor("-" * 60)
+    print(f"Screen: {results['screen']}")
+    print(f"Tmux: {results['tmux']}")
     print()
 
     # Check Docker containers
     print("5. Checking Docker containers:")
-    print("-" * 60)
-    output = run_command("docker ps | grep nanobot 2>/dev/null || echo 'No Docker containers found'")
-    print(output)
+    decor("-" * 60)
+    print(results["docker"])
     print()
 
-    print("=" * 60)
-    print("Diagnostic complete")
-    print("=" * 60)
-    print()
-    print("If you found multiple instances, stop them all before restarting:")
-    print("  1. pkill -9 -f 'python.*nanobot'")
-    print("  2. systemctl --user stop nanobot (if using systemd)")
-    print("  3. docker stop <container> (if using Docker)")
-    print("  4. Wait 30 seconds")
-    print("  5. python3 scripts/clear_telegram_webhook.py")
-    print("  6. Restart nanobot")
+    decor("=" * 60)
+    decor("Diagnostic complete")
+    decor("=" * 60)
+    decor()
+    decor("If you found multiple instances, stop them all before restarting:")
+    decor("  1. pkill -9 -f 'python.*nanobot'")
+    decor("  2. systemctl --user stop nanobot (if using systemd)")
+    decor("  3. docker stop <container> (if using Docker)")
+    decor("  4. Wait 30 seconds")
+    decor("  5. python3 scripts/clear_telegram_webhook.py")
+    decor("  6. Restart nanobot")
 
 
 if __name__ == "__main__":